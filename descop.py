@@ -1,26 +1,169 @@
-"""TrackingApp for Windows."""
+"""TrackingApp for Windows.
+
+Performance model: the app is bound by network latency and Tk rendering, not
+by CPU. One user action costs at most a TLS handshake (avoided by the pooled
+``SESSION``), one HTTP round trip per request (cut down by the bulk endpoints)
+and Treeview item churn (kept small by paging and incremental edits). Changes
+aimed at speed should shrink one of those three costs.
+"""
 from __future__ import annotations
 
+import collections
+import functools
+import itertools
 import json
+import os
+import sys
 import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime, date, time as dtime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError as exc:  # pragma: no cover - handled at runtime
     raise SystemExit(
         "The 'requests' package is required. Install it with 'pip install requests'."
     ) from exc
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    _loads = json.loads
+
 API_BASE = "https://tracking-api-b4jb.onrender.com"
+TREE_PAGE_SIZE = 200
+SYNC_BATCH_SIZE = 200
+# (connect, read) seconds: fail fast on an unreachable host, wait on slow bodies.
+TIMEOUT = (3.0, 10.0)
+PROBE_TIMEOUT = (2.0, 5.0)
+
+# Shared session so every call reuses the pooled keep-alive TLS connection.
+SESSION = requests.Session()
+SESSION.headers.update({"Accept": "application/json"})
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    # POST is left out on purpose: replaying /add_record can duplicate a scan.
+    max_retries=Retry(
+        total=3,
+        connect=2,
+        read=1,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset(["DELETE", "GET", "HEAD"]),
+    ),
+)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+
+
+# Reused worker threads for blocking HTTP and file work; Tk stays on the main thread.
+IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="descop-io")
+
+
+def _report_failure(future: Future) -> None:
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+
+
+def run_io(fn: Callable[..., None], *args: Any) -> None:
+    IO_POOL.submit(fn, *args).add_done_callback(_report_failure)
+
+
+# Set when the main window closes; workers then stop touching Tk and syncing.
+_CLOSING = threading.Event()
+
+
+def _post_tk(widget: tk.Misc, fn: Callable[..., None], *args: Any) -> None:
+    """Run ``fn`` on the Tk thread from a worker, unless the app is closing."""
+    if _CLOSING.is_set():
+        return
+    try:
+        widget.after(0, fn, *args)
+    except (RuntimeError, tk.TclError):
+        if not _CLOSING.is_set():
+            raise
+
+
+def _do_delete(
+    url: str,
+    on_ok: Callable[[], None],
+    on_err: Callable[[requests.RequestException], None],
+) -> None:
+    try:
+        response = SESSION.delete(url, timeout=TIMEOUT)
+        if response.status_code != 200:
+            raise requests.RequestException(f"status {response.status_code}")
+    except requests.RequestException as exc:
+        on_err(exc)
+        return
+    on_ok()
+
+
+def set_auth_token(token: Optional[str]) -> None:
+    if token:
+        SESSION.headers["Authorization"] = f"Bearer {token}"
+    else:
+        SESSION.headers.pop("Authorization", None)
+
+
+def _response_json(response: requests.Response) -> Any:
+    try:
+        return _loads(response.content)
+    except ValueError as exc:
+        raise requests.RequestException(f"invalid JSON: {exc}") from exc
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _post_json(url: str, payload: Any, token: Optional[str] = None) -> requests.Response:
+    """POST ``payload`` encoded with ``_dumps`` rather than requests' stdlib json.
+
+    ``token`` overrides the session's auth header for work that must not
+    depend on who is logged in when it runs.
+    """
+    headers = _JSON_HEADERS
+    if token:
+        headers = {**_JSON_HEADERS, "Authorization": f"Bearer {token}"}
+    return SESSION.post(url, data=_dumps(payload), headers=headers, timeout=TIMEOUT)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as fp:
+        fp.write(data)
+    os.replace(tmp, path)
+
+
 STATE_PATH = Path(__file__).with_name("tracking_app_state.json")
-QUEUE_PATH = Path(__file__).with_name("offline_queue.json")
+QUEUE_PATH = Path(__file__).with_name("offline_queue.jsonl")
+LEGACY_QUEUE_PATH = Path(__file__).with_name("offline_queue.json")
 
 
 @dataclass
@@ -32,74 +175,230 @@ class AppState:
 
     @classmethod
     def load(cls) -> "AppState":
-        if STATE_PATH.exists():
-            try:
-                data = json.loads(STATE_PATH.read_text(encoding="utf-8"))
-                return cls(**data)
-            except Exception:
-                STATE_PATH.unlink(missing_ok=True)
+        try:
+            raw = STATE_PATH.read_bytes()
+        except FileNotFoundError:
+            return cls()
+        try:
+            return cls(**_loads(raw))
+        except Exception:
+            STATE_PATH.unlink(missing_ok=True)
         return cls()
 
     def save(self) -> None:
-        STATE_PATH.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        _write_atomic(STATE_PATH, _dumps(asdict(self)))
 
 
 class OfflineQueue:
     _lock = threading.Lock()
+    _sync_lock = threading.Lock()  # held by the one running sync
+    _redo = False  # guarded by _lock
+    _cache: Optional[List[Dict[str, Any]]] = None
+    _cache_mtime_ns: Optional[int] = None
+    _append_fp: Optional[BinaryIO] = None
+    # Guarded by _lock: consecutive failed syncs and the time.monotonic()
+    # before which new sync attempts are skipped.
+    _failures = 0
+    _retry_at = 0.0
+
+    @staticmethod
+    def _mtime_ns() -> Optional[int]:
+        try:
+            return os.stat(QUEUE_PATH).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def _load(cls) -> List[Dict[str, Any]]:
+        """Return the in-memory queue, re-reading disk only if the file changed.
+
+        Callers must hold ``_lock`` and must not keep the list past it.
+        """
+        mtime_ns = cls._mtime_ns()
+        if cls._cache is None or mtime_ns != cls._cache_mtime_ns:
+            cls._close_append()  # the file may have been replaced under us
+            cls._cache = cls._read_disk()
+            cls._cache_mtime_ns = mtime_ns
+        return cls._cache
 
     @staticmethod
-    def _load() -> List[Dict[str, Any]]:
+    def _read_disk() -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        if LEGACY_QUEUE_PATH.exists():
+            # Queues written before the JSONL format were a single JSON array.
+            try:
+                records.extend(_loads(LEGACY_QUEUE_PATH.read_bytes()))
+            except Exception:
+                pass
         if QUEUE_PATH.exists():
+            for line in QUEUE_PATH.read_bytes().splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    records.append(_loads(line))
+                except Exception:
+                    continue  # torn write from a crash; drop just that line
+        for record in records:
+            record.setdefault("_qid", uuid.uuid4().hex)
+        return records
+
+    @staticmethod
+    def _payload(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in record.items() if k != "_qid"}
+
+    @classmethod
+    def _close_append(cls) -> None:
+        if cls._append_fp is not None:
+            cls._append_fp.close()
+            cls._append_fp = None
+
+    @classmethod
+    def _write(cls, records: List[Dict[str, Any]]) -> None:
+        cls._close_append()
+        _write_atomic(QUEUE_PATH, b"".join(_dumps(r) + b"\n" for r in records))
+        LEGACY_QUEUE_PATH.unlink(missing_ok=True)
+        cls._cache_mtime_ns = cls._mtime_ns()
+
+    @classmethod
+    def add_record(cls, record: Dict[str, Any]) -> None:
+        record["_qid"] = uuid.uuid4().hex
+        with cls._lock:
+            cls._load().append(record)
+            if cls._append_fp is None:
+                cls._append_fp = open(QUEUE_PATH, "ab")
+            cls._append_fp.write(_dumps(record) + b"\n")
+            cls._append_fp.flush()
+            cls._cache_mtime_ns = os.fstat(cls._append_fp.fileno()).st_mtime_ns
+
+    @classmethod
+    def _post_each(
+        cls, pending: List[Dict[str, Any]], token: str
+    ) -> List[Dict[str, Any]]:
+        synced: List[Dict[str, Any]] = []
+        for record in pending:
+            try:
+                response = _post_json(
+                    f"{API_BASE}/add_record", cls._payload(record), token
+                )
+                if response.status_code == 200:
+                    synced.append(record)
+            except requests.RequestException:
+                break
+        return synced
+
+    @classmethod
+    def _drop(cls, synced: List[Dict[str, Any]]) -> None:
+        """Remove acknowledged records from the queue; caller holds ``_lock``."""
+        cache = cls._load()
+        n = len(synced)
+        if len(cache) >= n and all(
+            a["_qid"] == b["_qid"] for a, b in zip(cache, synced)
+        ):
+            # Batches go out oldest first, so a fully accepted batch is the head.
+            del cache[:n]
+        else:
+            synced_ids = {r["_qid"] for r in synced}
+            cache[:] = [r for r in cache if r["_qid"] not in synced_ids]
+        cls._write(cache)
+
+    @classmethod
+    def _send_batch(
+        cls, batch: List[Dict[str, Any]], token: str
+    ) -> List[Dict[str, Any]]:
+        """Upload ``batch`` and return the records the server acknowledged."""
+        try:
+            response = _post_json(
+                f"{API_BASE}/add_records_bulk",
+                {"records": [cls._payload(r) for r in batch]},
+                token,
+            )
+        except requests.RequestException:
+            return []
+        if response.status_code == 200:
+            return list(batch)
+        if response.status_code == 404:
+            # Older servers have no bulk endpoint; send one by one.
+            return cls._post_each(batch, token)
+        if response.status_code in (401, 403, 429):
+            return []
+        if 400 <= response.status_code < 500:
+            # Only a body naming the rejected rows means the rest were stored;
+            # anything else (auth, size, validation) keeps the batch queued.
             try:
-                return json.loads(QUEUE_PATH.read_text(encoding="utf-8"))
+                failed = _response_json(response).get("failed_indices")
             except Exception:
-                QUEUE_PATH.unlink(missing_ok=True)
+                return []
+            if not isinstance(failed, list):
+                return []
+            rejected = set(failed)
+            return [r for i, r in enumerate(batch) if i not in rejected]
         return []
 
     @classmethod
-    def add_record(cls, record: Dict[str, Any]) -> None:
+    def reset_backoff(cls) -> None:
+        """Allow the next sync right away, e.g. after a live request succeeded."""
         with cls._lock:
-            pending = cls._load()
-            pending.append(record)
-            QUEUE_PATH.write_text(json.dumps(pending, indent=2), encoding="utf-8")
+            cls._failures = 0
+            cls._retry_at = 0.0
 
     @classmethod
     def sync_pending(
         cls, token: str, callback: Optional[Callable[[int], None]] = None
     ) -> None:
-        def worker() -> None:
+        with cls._lock:
+            if time.monotonic() < cls._retry_at:
+                # The last attempt failed; don't hammer a dead server on every scan.
+                return
+            if not cls._sync_lock.acquire(blocking=False):
+                # A sync is already running; ask it to go again when it finishes.
+                cls._redo = True
+                return
+
+        def run() -> None:
             with cls._lock:
-                pending = cls._load()
+                pending = list(cls._load())
             if not pending or not token:
                 return
-            synced: List[Dict[str, Any]] = []
-            for record in pending:
-                try:
-                    response = requests.post(
-                        f"{API_BASE}/add_record",
-                        json=record,
-                        headers={
-                            "Authorization": f"Bearer {token}",
-                            "Content-Type": "application/json",
-                        },
-                        timeout=10,
-                    )
-                    if response.status_code == 200:
-                        synced.append(record)
-                except requests.RequestException:
+            total = 0
+            for start in range(0, len(pending), SYNC_BATCH_SIZE):
+                if _CLOSING.is_set():
+                    break  # the rest waits for the next start
+                batch = pending[start : start + SYNC_BATCH_SIZE]
+                synced = cls._send_batch(batch, token)
+                if synced:
+                    # Drop acknowledged records now so a later failure keeps them sent.
+                    with cls._lock:
+                        cls._drop(synced)
+                    total += len(synced)
+                if len(synced) < len(batch):
+                    with cls._lock:
+                        cls._failures += 1
+                        cls._retry_at = time.monotonic() + min(60, 2**cls._failures)
                     break
-            if synced:
-                with cls._lock:
-                    remaining = [r for r in cls._load() if r not in synced]
-                    QUEUE_PATH.write_text(
-                        json.dumps(remaining, indent=2), encoding="utf-8"
-                    )
+            else:
+                cls.reset_backoff()
             if callback:
-                callback(len(synced))
+                callback(total)
+
+        def worker() -> None:
+            try:
+                run()
+            finally:
+                # Read _redo and release together so a request made while we
+                # were finishing is never lost.
+                with cls._lock:
+                    redo, cls._redo = cls._redo, False
+                    cls._sync_lock.release()
+            if redo:
+                cls.sync_pending(token, callback)
 
-        threading.Thread(target=worker, daemon=True).start()
+        try:
+            run_io(worker)
+        except RuntimeError:  # the pool is shut down; nothing will run it
+            cls._sync_lock.release()
 
 
+@functools.lru_cache(maxsize=8)
 def get_role_info(access_level: int, password: str) -> Dict[str, Any]:
     if access_level == 1 or password == "301993":
         return {"label": "🔑 Адмін", "color": "#e53935", "can_clear_history": True, "can_clear_errors": True}
@@ -110,6 +409,33 @@ def get_role_info(access_level: int, password: str) -> Dict[str, Any]:
     return {"label": "👁 Перегляд", "color": "#757575", "can_clear_history": False, "can_clear_errors": False}
 
 
+@functools.lru_cache(maxsize=8192)
+def _datetime_fields(value: Optional[str]) -> tuple[Optional[datetime], str]:
+    """Parsed and display form of a raw timestamp; bulk imports repeat them."""
+    dt = _parse_datetime(value)
+    return dt, dt.strftime("%d.%m.%Y %H:%M:%S") if dt else (value or "")
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    if value.endswith("Z"):
+        # fromisoformat only accepts the UTC designator from Python 3.11.
+        value = value[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(value)
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone()
+    except ValueError:
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(
+                tzinfo=timezone.utc
+            )
+        except ValueError:
+            return None
+
+
 class TrackingApp(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -119,6 +445,10 @@ class TrackingApp(tk.Tk):
         self.configure(bg="#0d47a1")
 
         self.state_data = AppState.load()
+        set_auth_token(self.state_data.token)
+        self.role_info = get_role_info(
+            self.state_data.access_level, self.state_data.last_password
+        )
         self._current_frame: Optional[tk.Frame] = None
 
         self.style = ttk.Style(self)
@@ -126,6 +456,8 @@ class TrackingApp(tk.Tk):
         self.style.configure("TLabel", font=("Segoe UI", 14))
         self.style.configure("TEntry", font=("Segoe UI", 16))
 
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
         if self.state_data.token and self.state_data.user_name:
             self.show_scanner()
         elif self.state_data.token:
@@ -133,6 +465,10 @@ class TrackingApp(tk.Tk):
         else:
             self.show_login()
 
+    def close(self) -> None:
+        _CLOSING.set()
+        self.destroy()
+
     def switch_to(self, frame_cls: type[tk.Frame]) -> None:
         if self._current_frame is not None:
             self._current_frame.destroy()
@@ -147,6 +483,9 @@ class TrackingApp(tk.Tk):
         self.switch_to(UserNameFrame)
 
     def show_scanner(self) -> None:
+        self.role_info = get_role_info(
+            self.state_data.access_level, self.state_data.last_password
+        )
         self.switch_to(ScannerFrame)
 
 
@@ -217,33 +556,34 @@ class LoginFrame(tk.Frame):
 
         def worker() -> None:
             try:
-                response = requests.post(
+                response = SESSION.post(
                     f"{API_BASE}/login",
                     params={"password": password},
-                    headers={"Accept": "application/json"},
-                    timeout=10,
+                    timeout=TIMEOUT,
                 )
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _response_json(response)
                     self.app.state_data.token = data.get("token")
+                    set_auth_token(self.app.state_data.token)
+                    OfflineQueue.reset_backoff()
                     self.app.state_data.access_level = data.get("access_level", 2)
                     self.app.state_data.last_password = password
                     self.app.state_data.save()
-                    self.after(0, self.app.show_username)
+                    _post_tk(self, self.app.show_username)
                 else:
                     try:
-                        message = response.json().get("message", "Невірний пароль")
+                        message = _response_json(response).get("message", "Невірний пароль")
                     except Exception:
                         message = "Невірний пароль"
-                    self.after(0, lambda: self.error_var.set(message))
+                    _post_tk(self, lambda: self.error_var.set(message))
             except requests.RequestException:
-                self.after(0, lambda: self.error_var.set("Помилка підключення до сервера"))
+                _post_tk(self, lambda: self.error_var.set("Помилка підключення до сервера"))
             finally:
-                self.after(0, lambda: self.set_loading(False))
+                _post_tk(self, lambda: self.set_loading(False))
 
         self.error_var.set("")
         self.set_loading(True)
-        threading.Thread(target=worker, daemon=True).start()
+        run_io(worker)
 
 
 class UserNameFrame(tk.Frame):
@@ -292,10 +632,9 @@ class ScannerFrame(tk.Frame):
         self.status_var = tk.StringVar()
         self.online_var = tk.StringVar(value="🔄 Перевірка з’єднання...")
         self.online_color = "#fdd835"
+        self._last_ok = 0.0
 
-        self.role_info = get_role_info(
-            app.state_data.access_level, app.state_data.last_password
-        )
+        self.role_info = app.role_info
 
         top_bar = tk.Frame(self, bg=self.online_color)
         top_bar.pack(fill="x")
@@ -386,6 +725,9 @@ class ScannerFrame(tk.Frame):
         ).pack()
 
         self.entry.focus_set()
+        self.after_idle(self._post_init)
+
+    def _post_init(self) -> None:
         self.check_connectivity()
         OfflineQueue.sync_pending(self.app.state_data.token or "")
 
@@ -400,16 +742,27 @@ class ScannerFrame(tk.Frame):
         self.online_label.master.configure(bg=self.online_color)
 
     def check_connectivity(self) -> None:
+        if time.monotonic() - self._last_ok < 15:
+            # A real request just succeeded; no need to probe the server.
+            self.set_online_state(True)
+            self.after(15000, self.check_connectivity)
+            return
+
         def worker() -> None:
+            if _CLOSING.is_set():
+                return
             try:
-                response = requests.head(API_BASE, timeout=5)
+                response = SESSION.head(API_BASE, timeout=PROBE_TIMEOUT)
                 online = response.status_code < 500
             except requests.RequestException:
                 online = False
-            self.after(0, lambda: self.set_online_state(online))
-            self.after(15000, self.check_connectivity)
+            _post_tk(self, self._on_probe, online)
+
+        run_io(worker)
 
-        threading.Thread(target=worker, daemon=True).start()
+    def _on_probe(self, online: bool) -> None:
+        self.set_online_state(online)
+        self.after(15000 if online else 5000, self.check_connectivity)
 
     def to_next(self) -> None:
         value = self.box_var.get().strip()
@@ -441,54 +794,55 @@ class ScannerFrame(tk.Frame):
             "ttn": ttn,
         }
         self.status_var.set("Відправлення...")
+        # Free the form right away so the next box can be scanned while this
+        # one is in flight; the status line reports the outcome when it lands.
+        self.reset_fields()
 
         def worker() -> None:
             token = self.app.state_data.token or ""
+            if _CLOSING.is_set():
+                # Keep the scan for the next start rather than send it on exit.
+                OfflineQueue.add_record(record)
+                return
             if not token:
                 OfflineQueue.add_record(record)
-                self.after(
-                    0,
+                _post_tk(
+                    self,
                     lambda: self.status_var.set(
                         "📦 Збережено локально. Увійдіть знову, щоб синхронізувати."
                     ),
                 )
-                self.after(0, self.reset_fields)
                 return
             try:
-                response = requests.post(
-                    f"{API_BASE}/add_record",
-                    json=record,
-                    headers={
-                        "Authorization": f"Bearer {token}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=10,
-                )
+                response = _post_json(f"{API_BASE}/add_record", record)
                 if response.status_code == 200:
-                    note = response.json().get("note", "")
+                    note = _response_json(response).get("note", "")
                     if note:
                         message = f"⚠️ Дублікат: {note}"
                     else:
                         message = "✅ Успішно додано"
-                    self.after(0, lambda: self.status_var.set(message))
-                    self.after(0, lambda: self.set_online_state(True))
+                    self._last_ok = time.monotonic()
+                    OfflineQueue.reset_backoff()
+                    _post_tk(self, lambda: self.status_var.set(message))
+                    _post_tk(self, lambda: self.set_online_state(True))
                 else:
                     raise requests.RequestException(f"status {response.status_code}")
             except requests.RequestException:
                 OfflineQueue.add_record(record)
-                self.after(0, lambda: self.status_var.set("📦 Збережено локально (офлайн)"))
-                self.after(0, lambda: self.set_online_state(False))
+                _post_tk(self, lambda: self.status_var.set("📦 Збережено локально (офлайн)"))
+                _post_tk(self, lambda: self.set_online_state(False))
             finally:
-                self.after(0, self.reset_fields)
                 OfflineQueue.sync_pending(token)
 
-        threading.Thread(target=worker, daemon=True).start()
+        run_io(worker)
 
     def logout(self) -> None:
         if not messagebox.askyesno("Підтвердження", "Вийти з акаунту?"):
             return
         self.app.state_data = AppState()
+        set_auth_token(None)
         self.app.state_data.save()
+        get_role_info.cache_clear()
         self.app.show_login()
 
     def open_history(self) -> None:
@@ -507,6 +861,10 @@ class HistoryWindow(tk.Toplevel):
 
         self.records: List[Dict[str, Any]] = []
         self.filtered: List[Dict[str, Any]] = []
+        self._visible: set[str] = set()
+        self._inserted: set[str] = set()
+        self._page_limit = TREE_PAGE_SIZE
+        self._page_pending = False
 
         filters = tk.Frame(self)
         filters.pack(fill="x", padx=12, pady=8)
@@ -517,6 +875,11 @@ class HistoryWindow(tk.Toplevel):
         self.date_filter: Optional[date] = None
         self.start_time: Optional[dtime] = None
         self.end_time: Optional[dtime] = None
+        self._filter_after: Optional[str] = None
+        self._fetch_seq = 0
+        self._last_filter: Optional[tuple[tuple[Any, ...], List[Dict[str, Any]]]] = None
+        # Set once the server reports it applied our filter params itself.
+        self._server_filters = False
 
         self._add_filter_entry(filters, "BoxID", self.box_filter)
         self._add_filter_entry(filters, "TTN", self.ttn_filter)
@@ -527,11 +890,15 @@ class HistoryWindow(tk.Toplevel):
         ttk.Button(filters, text="Кінець", command=lambda: self.pick_time(False)).pack(side="left", padx=4)
         ttk.Button(filters, text="Скинути", command=self.clear_filters).pack(side="left", padx=4)
         ttk.Button(filters, text="Оновити", command=self.fetch_history).pack(side="left", padx=4)
-        if get_role_info(app.state_data.access_level, app.state_data.last_password)["can_clear_history"]:
+        if app.role_info["can_clear_history"]:
             ttk.Button(filters, text="Очистити", command=self.clear_history).pack(side="right", padx=4)
 
+        table = tk.Frame(self)
+        table.pack(fill="both", expand=True, padx=12, pady=(0, 12))
         columns = ("datetime", "boxid", "ttn", "user", "note")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        self.tree = ttk.Treeview(table, columns=columns, show="headings")
+        self.scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
         headings = {
             "datetime": "Дата",
             "boxid": "BoxID",
@@ -542,7 +909,8 @@ class HistoryWindow(tk.Toplevel):
         for col, text in headings.items():
             self.tree.heading(col, text=text)
             self.tree.column(col, width=180 if col == "datetime" else 140, anchor="center")
-        self.tree.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
 
         self.fetch_history()
 
@@ -552,7 +920,41 @@ class HistoryWindow(tk.Toplevel):
         tk.Label(frame, text=label).pack(anchor="w")
         entry = ttk.Entry(frame, textvariable=variable, width=16)
         entry.pack()
-        entry.bind("<KeyRelease>", lambda _: self.apply_filters())
+        entry.bind("<KeyRelease>", lambda _: self._schedule_filter())
+
+    def _schedule_filter(self) -> None:
+        if self._filter_after:
+            self.after_cancel(self._filter_after)
+        self._filter_after = self.after(150, self._run_filter)
+
+    def _run_filter(self) -> None:
+        self._filter_after = None
+        self.refilter()
+
+    def refilter(self) -> None:
+        """Re-query the server when it filters for us, else filter locally."""
+        if self._server_filters:
+            self.fetch_history()
+        else:
+            self.apply_filters()
+
+    def _filter_params(self) -> Dict[str, str]:
+        params: Dict[str, str] = {}
+        for key, var in (
+            ("boxid", self.box_filter),
+            ("ttn", self.ttn_filter),
+            ("user", self.user_filter),
+        ):
+            value = var.get().strip()
+            if value:
+                params[key] = value
+        if self.date_filter:
+            params["date"] = self.date_filter.isoformat()
+        if self.start_time:
+            params["start_time"] = self.start_time.strftime("%H:%M")
+        if self.end_time:
+            params["end_time"] = self.end_time.strftime("%H:%M")
+        return params
 
     def pick_date(self) -> None:
         value = simpledialog.askstring("Дата", "Введіть дату у форматі ДД.ММ.РРРР", parent=self)
@@ -564,7 +966,7 @@ class HistoryWindow(tk.Toplevel):
                 return
         else:
             self.date_filter = None
-        self.apply_filters()
+        self.refilter()
 
     def pick_time(self, is_start: bool) -> None:
         value = simpledialog.askstring("Час", "Введіть час у форматі ГГ:ХХ", parent=self)
@@ -583,7 +985,7 @@ class HistoryWindow(tk.Toplevel):
                 self.start_time = None
             else:
                 self.end_time = None
-        self.apply_filters()
+        self.refilter()
 
     def clear_filters(self) -> None:
         self.box_filter.set("")
@@ -592,86 +994,216 @@ class HistoryWindow(tk.Toplevel):
         self.date_filter = None
         self.start_time = None
         self.end_time = None
-        self.apply_filters()
+        self.refilter()
 
     def fetch_history(self) -> None:
         token = self.app.state_data.token
         if not token:
             messagebox.showerror("Помилка", "Необхідна авторизація")
             return
+        self._fetch_seq += 1
+        seq = self._fetch_seq
+        params = {"stream": "ndjson", **self._filter_params()}
 
         def worker() -> None:
             try:
-                response = requests.get(
+                with SESSION.get(
                     f"{API_BASE}/get_history",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    fallback = datetime.min.replace(tzinfo=timezone.utc)
-                    data.sort(
-                        key=lambda r: self._parse_datetime(r.get("datetime")) or fallback,
-                        reverse=True,
-                    )
-                    self.records = data
-                    self.after(0, self.apply_filters)
-                else:
-                    raise requests.RequestException(f"status {response.status_code}")
+                    params=params,
+                    timeout=TIMEOUT,
+                    stream=True,
+                ) as response:
+                    if response.status_code != 200:
+                        raise requests.RequestException(f"status {response.status_code}")
+                    if seq == self._fetch_seq:
+                        self._server_filters = (
+                            response.headers.get("X-Filters-Applied") == "1"
+                        )
+                    if "ndjson" in response.headers.get("Content-Type", ""):
+                        data = self._stream_pages(response, seq)
+                    else:
+                        data = _response_json(response)
+                        self._prepare(data)
+                fallback = datetime.min.replace(tzinfo=timezone.utc)
+                data.sort(key=lambda r: r["_dt"] or fallback, reverse=True)
+                _post_tk(self, lambda: self._finish_fetch(seq, data))
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося завантажити історію: {exc}"))
+                _post_tk(self, lambda exc=exc: messagebox.showerror("Помилка", f"Не вдалося завантажити історію: {exc}"))
+
+        run_io(worker)
+
+    def _finish_fetch(self, seq: int, data: List[Dict[str, Any]]) -> None:
+        if seq == self._fetch_seq:  # drop responses overtaken by a newer fetch
+            self.set_records(data)
+
+    def _stream_pages(self, response: requests.Response, seq: int) -> List[Dict[str, Any]]:
+        """Read an NDJSON body, handing each page of rows to the UI as it arrives."""
+        data: List[Dict[str, Any]] = []
+        batch: List[Dict[str, Any]] = []
+        for line in response.iter_lines():
+            if _CLOSING.is_set():
+                break
+            if not line:
+                continue
+            try:
+                batch.append(_loads(line))
+            except ValueError as exc:
+                raise requests.RequestException(f"invalid JSON: {exc}") from exc
+            if len(batch) >= TREE_PAGE_SIZE:
+                self._prepare(batch)
+                _post_tk(self, self._append_rows, seq, batch, not data)
+                data.extend(batch)
+                batch = []
+        self._prepare(batch)
+        data.extend(batch)
+        return data
+
+    def _append_rows(self, seq: int, batch: List[Dict[str, Any]], reset: bool) -> None:
+        if seq != self._fetch_seq:
+            return
+        if reset:
+            self.set_records(list(batch))
+            return
+        start = len(self.records)
+        for index, item in enumerate(batch, start):
+            item["_iid"] = str(index)
+        self.records.extend(batch)
+        self._last_filter = None
+        if len(self._visible) < self._page_limit:
+            self.apply_filters()
 
-        threading.Thread(target=worker, daemon=True).start()
+    @staticmethod
+    def _prepare(records: List[Dict[str, Any]]) -> None:
+        """Parse timestamps, lower-case searchable fields and build tree values once."""
+        for r in records:
+            r["_dt"], r["_dt_txt"] = _datetime_fields(r.get("datetime"))
+            user = r.get("user_name", "")
+            if isinstance(user, str):
+                # A handful of operators repeat across thousands of rows.
+                r["user_name"] = user = sys.intern(user)
+            r["_boxid_lc"] = str(r.get("boxid", "")).lower()
+            r["_ttn_lc"] = str(r.get("ttn", "")).lower()
+            r["_user_lc"] = str(user).lower()
+            r["_values"] = (
+                r["_dt_txt"],
+                r.get("boxid", ""),
+                r.get("ttn", ""),
+                user,
+                r.get("note", ""),
+            )
 
     def apply_filters(self) -> None:
-        filtered = list(self.records)
-        if self.box_filter.get():
-            needle = self.box_filter.get().strip()
-            filtered = [r for r in filtered if needle.lower() in str(r.get("boxid", "")).lower()]
-        if self.ttn_filter.get():
-            needle = self.ttn_filter.get().strip()
-            filtered = [r for r in filtered if needle.lower() in str(r.get("ttn", "")).lower()]
-        if self.user_filter.get():
-            needle = self.user_filter.get().strip()
-            filtered = [r for r in filtered if needle.lower() in str(r.get("user_name", "")).lower()]
-        if self.date_filter:
-            filtered = [
-                r
-                for r in filtered
-                if self._parse_datetime(r.get("datetime"))
-                and self._parse_datetime(r.get("datetime")).date() == self.date_filter
-            ]
-        if self.start_time or self.end_time:
-            tmp = []
-            for r in filtered:
-                dt = self._parse_datetime(r.get("datetime"))
+        if self._server_filters:
+            # The server already returned only matching rows.
+            self.filtered = list(self.records)
+        else:
+            self.filtered = self._filter_locally()
+        self._page_limit = TREE_PAGE_SIZE
+        self._render_page()
+
+    def _filter_locally(self) -> List[Dict[str, Any]]:
+        box_needle = self.box_filter.get().strip().lower()
+        ttn_needle = self.ttn_filter.get().strip().lower()
+        user_needle = self.user_filter.get().strip().lower()
+        date_f, start_t, end_t = self.date_filter, self.start_time, self.end_time
+        if not (box_needle or ttn_needle or user_needle or date_f or start_t or end_t):
+            self._last_filter = None
+            return list(self.records)
+        key = (box_needle, ttn_needle, user_needle, date_f, start_t, end_t)
+        source = self.records
+        if self._last_filter is not None:
+            # Typing more characters can only narrow the match, so search
+            # within the previous result instead of the whole history.
+            prev_key, prev_result = self._last_filter
+            if prev_key[3:] == key[3:] and all(
+                old in new for old, new in zip(prev_key[:3], key[:3])
+            ):
+                source = prev_result
+        text_filters = [
+            (field, needle)
+            for field, needle in (
+                ("_boxid_lc", box_needle),
+                ("_ttn_lc", ttn_needle),
+                ("_user_lc", user_needle),
+            )
+            if needle
+        ]
+        if len(text_filters) == 1 and not (date_f or start_t or end_t):
+            # Common case: one text box in use. A bare comprehension keeps the
+            # per-row work to one dict lookup and one substring test.
+            field, needle = text_filters[0]
+            filtered = [r for r in source if needle in r[field]]
+            self._last_filter = (key, filtered)
+            return filtered
+        filtered = []
+        for r in source:
+            if box_needle and box_needle not in r["_boxid_lc"]:
+                continue
+            if ttn_needle and ttn_needle not in r["_ttn_lc"]:
+                continue
+            if user_needle and user_needle not in r["_user_lc"]:
+                continue
+            dt = r["_dt"]
+            if date_f and (not dt or dt.date() != date_f):
+                continue
+            if start_t or end_t:
                 if not dt:
                     continue
                 tm = dt.time()
-                if self.start_time and tm < self.start_time:
+                if start_t and tm < start_t:
                     continue
-                if self.end_time and tm > self.end_time:
+                if end_t and tm > end_t:
                     continue
-                tmp.append(r)
-            filtered = tmp
-
-        self.filtered = filtered
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for item in filtered:
-            dt = self._parse_datetime(item.get("datetime"))
-            dt_txt = dt.strftime("%d.%m.%Y %H:%M:%S") if dt else item.get("datetime", "")
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    dt_txt,
-                    item.get("boxid", ""),
-                    item.get("ttn", ""),
-                    item.get("user_name", ""),
-                    item.get("note", ""),
-                ),
-            )
+            filtered.append(r)
+        self._last_filter = (key, filtered)
+        return filtered
+
+    def _render_page(self) -> None:
+        """Attach the first ``_page_limit`` filtered rows, inserting on demand."""
+        self._page_pending = False
+        shown = self.filtered[: self._page_limit]
+        visible_set = {r["_iid"] for r in shown}
+        hidden = self._visible - visible_set
+        if hidden:
+            self.tree.detach(*hidden)
+        visible, inserted = self._visible, self._inserted
+        insert, reattach = self.tree.insert, self.tree.reattach
+        # Rows keep their sorted order, so a newly shown row goes straight
+        # to its final index and rows already attached never move.
+        for index, item in enumerate(shown):
+            iid = item["_iid"]
+            if iid in visible:
+                continue
+            if iid in inserted:
+                reattach(iid, "", index)
+            else:
+                insert("", index, iid=iid, values=item["_values"])
+                inserted.add(iid)
+        self._visible = visible_set
+
+    def _on_tree_scroll(self, first: str, last: str) -> None:
+        self.scrollbar.set(first, last)
+        if (
+            float(last) > 0.9
+            and self._page_limit < len(self.filtered)
+            and not self._page_pending
+        ):
+            # Wheel bursts report several scrolls before idle; add one page.
+            self._page_pending = True
+            self._page_limit += TREE_PAGE_SIZE
+            self.after_idle(self._render_page)
+
+    def set_records(self, records: List[Dict[str, Any]]) -> None:
+        """Replace the loaded history; tree rows are created lazily per page."""
+        if self._inserted:
+            self.tree.delete(*self._inserted)
+        self._inserted = set()
+        self._visible = set()
+        self._last_filter = None
+        self.records = records
+        for index, item in enumerate(records):
+            item["_iid"] = str(index)
+        self.apply_filters()
 
     def clear_history(self) -> None:
         if not messagebox.askyesno("Підтвердження", "Очистити історію? Це незворотньо."):
@@ -680,42 +1212,13 @@ class HistoryWindow(tk.Toplevel):
         if not token:
             return
 
-        def worker() -> None:
-            try:
-                response = requests.delete(
-                    f"{API_BASE}/clear_tracking",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
-                )
-                if response.status_code == 200:
-                    def update() -> None:
-                        self.records.clear()
-                        self.apply_filters()
+        def on_ok() -> None:
+            _post_tk(self, lambda: self.set_records([]))
 
-                    self.after(0, update)
-                else:
-                    raise requests.RequestException(f"status {response.status_code}")
-            except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
+        def on_err(exc: requests.RequestException) -> None:
+            _post_tk(self, lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
 
-        threading.Thread(target=worker, daemon=True).start()
-
-    @staticmethod
-    def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
-        if not value:
-            return None
-        try:
-            dt = datetime.fromisoformat(value)
-            if dt.tzinfo is None:
-                return dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone()
-        except ValueError:
-            try:
-                return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(
-                    tzinfo=timezone.utc
-                )
-            except ValueError:
-                return None
+        run_io(_do_delete, f"{API_BASE}/clear_tracking", on_ok, on_err)
 
 
 class ErrorsWindow(tk.Toplevel):
@@ -726,7 +1229,13 @@ class ErrorsWindow(tk.Toplevel):
         self.title("Журнал помилок")
         self.geometry("900x650")
 
-        self.records: List[Dict[str, Any]] = []
+        self.records: Dict[Any, Dict[str, Any]] = {}  # by id, newest first
+        self._rendered = 0
+        self._more_pending = False
+        self._iid_to_id: Dict[str, Any] = {}
+        self._ui_queue: collections.deque[Callable[[], None]] = collections.deque()
+        self._ui_lock = threading.Lock()
+        self._ui_scheduled = False
 
         toolbar = tk.Frame(self)
         toolbar.pack(fill="x", padx=12, pady=8)
@@ -734,8 +1243,12 @@ class ErrorsWindow(tk.Toplevel):
         if role_info.get("can_clear_errors"):
             ttk.Button(toolbar, text="Очистити всі", command=self.clear_errors).pack(side="left", padx=4)
 
+        table = tk.Frame(self)
+        table.pack(fill="both", expand=True, padx=12, pady=(0, 12))
         columns = ("datetime", "boxid", "ttn", "user", "reason")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        self.tree = ttk.Treeview(table, columns=columns, show="headings")
+        self.scrollbar = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
         headings = {
             "datetime": "Дата",
             "boxid": "BoxID",
@@ -746,13 +1259,36 @@ class ErrorsWindow(tk.Toplevel):
         for col, text in headings.items():
             self.tree.heading(col, text=text)
             self.tree.column(col, width=160 if col == "reason" else 140, anchor="center")
-        self.tree.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
 
         if role_info.get("can_clear_errors"):
             self.tree.bind("<Double-1>", self.delete_selected_error)
+            self.tree.bind("<Delete>", self.delete_selected_error)
 
         self.fetch_errors()
 
+    def _post_ui(self, fn: Callable[[], None]) -> None:
+        """Queue ``fn`` for the Tk thread; one callback drains the batch."""
+        with self._ui_lock:
+            self._ui_queue.append(fn)
+            if self._ui_scheduled:
+                return
+            self._ui_scheduled = True
+        _post_tk(self, self._drain_ui)
+
+    def _drain_ui(self) -> None:
+        with self._ui_lock:
+            pending = list(self._ui_queue)
+            self._ui_queue.clear()
+            self._ui_scheduled = False
+        for fn in pending:
+            try:
+                fn()
+            except Exception:
+                # Only tk.Tk has report_callback_exception; Toplevel does not.
+                self.app.report_callback_exception(*sys.exc_info())
+
     def fetch_errors(self) -> None:
         token = self.app.state_data.token
         if not token:
@@ -761,54 +1297,105 @@ class ErrorsWindow(tk.Toplevel):
 
         def worker() -> None:
             try:
-                response = requests.get(
+                response = SESSION.get(
                     f"{API_BASE}/get_errors",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
+                    timeout=TIMEOUT,
                 )
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _response_json(response)
+                    self._prepare(data)
                     fallback = datetime.min.replace(tzinfo=timezone.utc)
-                    data.sort(
-                        key=lambda r: HistoryWindow._parse_datetime(r.get("datetime"))
-                        or fallback,
-                        reverse=True,
-                    )
-                    self.records = data
-                    self.after(0, self.render_records)
+                    data.sort(key=lambda r: r["_dt"] or fallback, reverse=True)
+                    self._post_ui(lambda: self._finish_fetch(data))
                 else:
                     raise requests.RequestException(f"status {response.status_code}")
             except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося завантажити: {exc}"))
+                self._post_ui(lambda exc=exc: messagebox.showerror("Помилка", f"Не вдалося завантажити: {exc}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        run_io(worker)
+
+    def _finish_fetch(self, data: List[Dict[str, Any]]) -> None:
+        # Swap records on the Tk thread so paging and deletes never see new
+        # records against the old tree rows.
+        self.records = {r.get("id"): r for r in data}
+        self.render_records()
 
     def render_records(self) -> None:
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for item in self.records:
-            dt = HistoryWindow._parse_datetime(item.get("datetime"))
-            dt_txt = dt.strftime("%d.%m.%Y %H:%M:%S") if dt else item.get("datetime", "")
-            reason = (
-                item.get("error_message")
-                or item.get("reason")
-                or item.get("note")
-                or item.get("message")
-                or item.get("error")
+        """Show the loaded records, reusing tree rows that are still present.
+
+        Logged errors never change, so a row whose iid survives a reload keeps
+        its values and is only moved into place. When the surviving rows are
+        already in order (the usual reload) no moves are issued at all.
+        """
+        end = min(max(self._rendered, TREE_PAGE_SIZE), len(self.records))
+        target = list(itertools.islice(self.records.values(), end))
+        survivors = [str(item.get("id", "")) for item in target]
+        keep = set(survivors)
+        children = self.tree.get_children()
+        existing = set(children)
+        stale = existing - keep
+        if stale:
+            self.tree.delete(*stale)
+        in_order = [iid for iid in children if iid in keep] == [
+            iid for iid in survivors if iid in existing
+        ]
+        self._iid_to_id.clear()
+        for index, item in enumerate(target):
+            iid = survivors[index]
+            self._iid_to_id[iid] = item.get("id")
+            if iid in existing:
+                if not in_order:
+                    self.tree.move(iid, "", index)
+            else:
+                self.tree.insert("", index, iid=iid, values=item["_values"])
+        self._rendered = end
+
+    def _render_more(self) -> None:
+        """Insert the next page of records below the rows already shown."""
+        self._more_pending = False
+        end = self._rendered + TREE_PAGE_SIZE
+        iid_to_id, insert = self._iid_to_id, self.tree.insert
+        for item in itertools.islice(self.records.values(), self._rendered, end):
+            iid = str(item.get("id", ""))
+            iid_to_id[iid] = item.get("id")
+            insert("", "end", iid=iid, values=item["_values"])
+        self._rendered = min(end, len(self.records))
+
+    @classmethod
+    def _prepare(cls, records: List[Dict[str, Any]]) -> None:
+        """Parse timestamps, pick the reason text and build tree values once."""
+        for r in records:
+            r["_dt"], r["_dt_txt"] = _datetime_fields(r.get("datetime"))
+            r["_reason"] = (
+                r.get("error_message")
+                or r.get("reason")
+                or r.get("note")
+                or r.get("message")
+                or r.get("error")
                 or "Причина не вказана"
             )
-            self.tree.insert(
-                "",
-                "end",
-                iid=str(item.get("id", "")),
-                values=(
-                    dt_txt,
-                    item.get("boxid", ""),
-                    item.get("ttn", ""),
-                    item.get("user_name", ""),
-                    reason,
-                ),
-            )
+            r["_values"] = cls._row_values(r)
+
+    @staticmethod
+    def _row_values(item: Dict[str, Any]) -> tuple[Any, ...]:
+        return (
+            item["_dt_txt"],
+            item.get("boxid", ""),
+            item.get("ttn", ""),
+            item.get("user_name", ""),
+            item["_reason"],
+        )
+
+    def _on_tree_scroll(self, first: str, last: str) -> None:
+        self.scrollbar.set(first, last)
+        if (
+            float(last) > 0.9
+            and self._rendered < len(self.records)
+            and not self._more_pending
+        ):
+            # Wheel bursts report several scrolls before idle; add one page.
+            self._more_pending = True
+            self.after_idle(self._render_more)
 
     def clear_errors(self) -> None:
         if not messagebox.askyesno("Підтвердження", "Очистити журнал помилок?"):
@@ -817,35 +1404,31 @@ class ErrorsWindow(tk.Toplevel):
         if not token:
             return
 
-        def worker() -> None:
-            try:
-                response = requests.delete(
-                    f"{API_BASE}/clear_errors",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
-                )
-                if response.status_code == 200:
-                    def update() -> None:
-                        self.records.clear()
-                        self.render_records()
+        def update() -> None:
+            self.records.clear()
+            self.tree.delete(*self.tree.get_children())
+            self._rendered = 0
+            self._iid_to_id.clear()
 
-                    self.after(0, update)
-                else:
-                    raise requests.RequestException(f"status {response.status_code}")
-            except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
+        def on_err(exc: requests.RequestException) -> None:
+            self._post_ui(lambda: messagebox.showerror("Помилка", f"Не вдалося очистити: {exc}"))
 
-        threading.Thread(target=worker, daemon=True).start()
+        run_io(_do_delete, f"{API_BASE}/clear_errors", lambda: self._post_ui(update), on_err)
 
     def delete_selected_error(self, event: tk.Event) -> None:
-        item_id = self.tree.focus()
-        if not item_id:
-            return
-        try:
-            record_id = int(float(item_id))
-        except ValueError:
+        iids: Dict[Any, str] = {}
+        for item_id in self.tree.selection() or (self.tree.focus(),):
+            record_id = self._iid_to_id.get(item_id)
+            if record_id is not None:
+                iids[record_id] = item_id
+        record_ids = list(iids)
+        if not record_ids:
             return
-        if not messagebox.askyesno("Підтвердження", f"Видалити помилку #{record_id}?"):
+        if len(record_ids) == 1:
+            prompt = f"Видалити помилку #{record_ids[0]}?"
+        else:
+            prompt = f"Видалити вибрані помилки ({len(record_ids)})?"
+        if not messagebox.askyesno("Підтвердження", prompt):
             return
         token = self.app.state_data.token
         if not token:
@@ -853,30 +1436,67 @@ class ErrorsWindow(tk.Toplevel):
 
         def worker() -> None:
             try:
-                response = requests.delete(
+                deleted = self._delete_ids(record_ids)
+
+                def update() -> None:
+                    for record_id in deleted:
+                        self.records.pop(record_id, None)
+                        self._iid_to_id.pop(iids[record_id], None)
+                    # A reload that landed first may already have dropped them.
+                    shown = [iids[i] for i in deleted if self.tree.exists(iids[i])]
+                    if shown:
+                        self.tree.delete(*shown)
+                    self._rendered -= len(shown)
+
+                self._post_ui(update)
+                if len(deleted) < len(record_ids):
+                    raise requests.RequestException(
+                        f"видалено {len(deleted)} з {len(record_ids)}"
+                    )
+            except requests.RequestException as exc:
+                self._post_ui(lambda exc=exc: messagebox.showerror("Помилка", f"Не вдалося видалити: {exc}"))
+
+        run_io(worker)
+
+    @staticmethod
+    def _delete_ids(record_ids: List[int]) -> set[int]:
+        """Delete errors in one call, falling back to per-id calls on old servers."""
+        if len(record_ids) > 1:
+            response = _post_json(f"{API_BASE}/delete_errors", {"ids": record_ids})
+            if response.status_code == 200:
+                return set(record_ids)
+            if response.status_code != 404:
+                raise requests.RequestException(f"status {response.status_code}")
+        deleted: set[int] = set()
+        for record_id in record_ids:
+            try:
+                response = SESSION.delete(
                     f"{API_BASE}/delete_error/{record_id}",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10,
+                    timeout=TIMEOUT,
                 )
-                if response.status_code == 200:
-                    def update() -> None:
-                        self.records = [
-                            r for r in self.records if r.get("id") != record_id
-                        ]
-                        self.render_records()
-
-                    self.after(0, update)
-                else:
+            except requests.RequestException:
+                if not deleted:
+                    raise
+                break
+            if response.status_code != 200:
+                if not deleted:
                     raise requests.RequestException(f"status {response.status_code}")
-            except requests.RequestException as exc:
-                self.after(0, lambda: messagebox.showerror("Помилка", f"Не вдалося видалити: {exc}"))
-
-        threading.Thread(target=worker, daemon=True).start()
+                break
+            deleted.add(record_id)
+        return deleted
 
 
 def main() -> None:
     app = TrackingApp()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        _CLOSING.set()
+        # Queued tasks still run but see _CLOSING: they skip Tk and further
+        # sync batches, and a scan not yet sent goes to the offline queue.
+        # The interpreter joins the pool threads at exit, so only a request
+        # already in flight (bounded by TIMEOUT) can delay it.
+        IO_POOL.shutdown(wait=False)
 
 
 if __name__ == "__main__":  # pragma: no cover